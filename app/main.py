@@ -1,7 +1,12 @@
+import json
+import httpx
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import ValidationError
-from app.models import BrandContext, FetchRequest
-from app.services.scrapers import fetch_brand_context
+from app.models import BrandContext, InsightsResponse, FetchRequest, StreamVariantsRequest
+from app.services.scrapers import fetch_brand_context, iter_product_pages, dedupe_raw_products
+from app.services.helpers import norm_base, fetch_text, is_shopify_html
+from app.services.variants import VariantTableBuilder, iter_variant_rows
 from app.services.gemini_service import structure_data_with_gemini
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -15,12 +20,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.post("/fetch-insights", response_model=BrandContext)
+@app.post("/fetch-insights", response_model=InsightsResponse)
 async def fetch_insights(req: FetchRequest):
     try:
         # 1. Scrape the raw data
         print(f"Starting scrape for: {req.website_url}")
-        raw_data_object = await fetch_brand_context(str(req.website_url))
+        variant_builder = VariantTableBuilder() if req.include_variants else None
+        raw_data_object = await fetch_brand_context(
+            str(req.website_url),
+            include_catalog_summary=req.include_catalog_summary,
+            include_product_catalog=req.include_product_catalog,
+            variant_builder=variant_builder,
+        )
         raw_data_dict = raw_data_object.model_dump(mode='json')
 
         if not raw_data_dict.get("is_shopify"):
@@ -29,10 +40,12 @@ async def fetch_insights(req: FetchRequest):
         # 2. ✨ SEPARATE the data
         # Store the original, raw product catalog in a separate variable
         original_product_catalog = raw_data_dict.get("product_catalog", [])
+        catalog_summary = raw_data_dict.get("catalog_summary")
         
         # Now remove it so we can send the smaller data package to Gemini
         raw_data_dict.pop("product_catalog", None)
         raw_data_dict.pop("hero_products", None)
+        raw_data_dict.pop("catalog_summary", None)
 
         # 3. ✨ Get the CLEAN brand info from Gemini
         print("Structuring brand info (FAQs, About Us, etc.) with Gemini...")
@@ -42,10 +55,19 @@ async def fetch_insights(req: FetchRequest):
         # Take the clean brand info from Gemini and add the original, raw product catalog back.
         final_data = structured_brand_info
         final_data["product_catalog"] = original_product_catalog
+        final_data["catalog_summary"] = catalog_summary
 
         # 5. Validate the final combined data and return
         print("Validating final data structure...")
         validated_data = BrandContext(**final_data)
+
+        # 6. Attach the variant table last so its typed arrays are only
+        # converted once, straight into the response
+        if variant_builder is not None:
+            payload = validated_data.model_dump(mode='json')
+            payload["variant_table"] = variant_builder.to_dict()
+            print("Process complete. Returning data with variant table.")
+            return JSONResponse(payload)
         
         print("Process complete. Returning data.")
         return validated_data
@@ -57,4 +79,38 @@ async def fetch_insights(req: FetchRequest):
         raise
     except Exception as e:
         print(f"UNEXPECTED ERROR: {e}")
-        raise HTTPException(status_code=500, detail=f"An internal error occurred: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"An internal error occurred: {e}")
+
+@app.post("/fetch-variants")
+async def fetch_variants(req: StreamVariantsRequest):
+    """
+    Streams every variant as NDJSON, one products.json page at a time.
+    The last line is {"status": "complete", "count": N}, or
+    {"status": "error", ...} if the catalog could not be read to the end.
+    """
+    base = norm_base(str(req.website_url))
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        try:
+            home_html = await fetch_text(client, base)
+        except Exception:
+            home_html = ""
+    if not is_shopify_html(home_html):
+        raise HTTPException(status_code=401, detail="Website not found or not a Shopify store")
+
+    async def variant_lines():
+        # The client is opened here so nothing is left open if the body is never read
+        count = 0
+        seen = set()
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            try:
+                async for items in iter_product_pages(client, base, raise_errors=True):
+                    for row in iter_variant_rows(dedupe_raw_products(items, seen)):
+                        count += 1
+                        yield json.dumps(row) + "\n"
+                yield json.dumps({"status": "complete", "count": count}) + "\n"
+            except Exception as e:
+                print(f"STREAM ERROR: {e}")
+                yield json.dumps({"status": "error", "count": count, "detail": str(e)}) + "\n"
+
+    print(f"Streaming variants for: {req.website_url}")
+    return StreamingResponse(variant_lines(), media_type="application/x-ndjson")
@@ -6,6 +6,25 @@ from typing import List, Optional, Dict
 # ✨ Added the missing FetchRequest model needed by main.py
 class FetchRequest(BaseModel):
     website_url: HttpUrl
+    include_catalog_summary: bool = False
+    include_product_catalog: bool = True
+    include_variants: bool = False
+
+class StreamVariantsRequest(BaseModel):
+    website_url: HttpUrl
+
+class VariantTable(BaseModel):
+    # Columnar variant data: string columns hold indexes into `strings` (-1 = missing)
+    count: int = 0
+    strings: List[str] = Field(default_factory=list)
+    product: List[int] = Field(default_factory=list)
+    variant_id: List[Optional[int]] = Field(default_factory=list)
+    sku: List[int] = Field(default_factory=list)
+    title: List[int] = Field(default_factory=list)
+    price: List[Optional[float]] = Field(default_factory=list)
+    compare_at_price: List[Optional[float]] = Field(default_factory=list)
+    available: List[bool] = Field(default_factory=list)
+    options: List[List[int]] = Field(default_factory=list)
 
 class Product(BaseModel):
     title: str
@@ -50,6 +69,39 @@ class ImportantLinks(BaseModel):
     # ✨ Changed to use default_factory
     others: Dict[str, str] = Field(default_factory=dict)
 
+class PriceStats(BaseModel):
+    count: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    percentiles: Dict[str, float] = Field(default_factory=dict)
+
+class VariantStats(BaseModel):
+    total: int = 0
+    available: int = 0
+    min_per_product: int = 0
+    max_per_product: int = 0
+    mean_per_product: float = 0.0
+
+class CatalogSummary(BaseModel):
+    product_count: int = 0
+    variants: VariantStats = Field(default_factory=VariantStats)
+    prices: Optional[PriceStats] = None
+    currencies: Dict[str, int] = Field(default_factory=dict)
+    # tags/product_types/vendors hold the most frequent values only;
+    # the distinct_* counts tell whether a histogram was cut short
+    tags: Dict[str, int] = Field(default_factory=dict)
+    distinct_tags: int = 0
+    product_types: Dict[str, int] = Field(default_factory=dict)
+    distinct_product_types: int = 0
+    vendors: Dict[str, int] = Field(default_factory=dict)
+    distinct_vendors: int = 0
+    # Handles seen on more than one products.json item, and titles shared
+    # by distinct products
+    duplicate_handles: List[str] = Field(default_factory=list)
+    duplicate_titles: List[str] = Field(default_factory=list)
+
 class BrandContext(BaseModel):
     is_shopify: bool
     brand_name: Optional[str] = None
@@ -58,10 +110,16 @@ class BrandContext(BaseModel):
     # ✨ Changed all mutable and nested model defaults to use Field(default_factory=...)
     product_catalog: List[Product] = Field(default_factory=list)
     hero_products: List[Product] = Field(default_factory=list)
+    catalog_summary: Optional[CatalogSummary] = None
 
     policies: Policies = Field(default_factory=Policies)
     faqs: List[FAQ] = Field(default_factory=list)
     social_handles: SocialHandles = Field(default_factory=SocialHandles)
     contact_details: ContactDetails = Field(default_factory=ContactDetails)
     about_text: Optional[str] = None
-    important_links: ImportantLinks = Field(default_factory=ImportantLinks)
\ No newline at end of file
+    important_links: ImportantLinks = Field(default_factory=ImportantLinks)
+
+class InsightsResponse(BrandContext):
+    # Response shape of /fetch-insights. variant_table is attached in main.py
+    # straight from VariantTableBuilder.to_dict(), so it is never filled here.
+    variant_table: Optional[VariantTable] = None
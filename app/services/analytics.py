@@ -0,0 +1,149 @@
+from array import array
+from typing import List, Dict, Optional
+import numpy as np
+from app.models import CatalogSummary, PriceStats, VariantStats
+from .helpers import raw_product_key, raw_variant_price
+
+TOP_N = 50
+PERCENTILES = (10, 25, 75, 90)
+
+def _tags_of(p: Dict) -> List[str]:
+    tags = p.get("tags") or []
+    # Some storefronts still return tags as one comma-separated string
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return [t.strip().lower() for t in tags if t and t.strip()]
+
+def _variant_price(v: Dict) -> float:
+    try:
+        return float(raw_variant_price(v))
+    except (TypeError, ValueError):
+        return np.nan
+
+class _Factor:
+    """Maps strings to integer codes so counting is a single np.bincount."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.codes = array("i")
+
+    def add(self, value: str) -> None:
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self._ids[value] = idx
+            self.values.append(value)
+        self.codes.append(idx)
+
+    def counts(self) -> np.ndarray:
+        codes = np.frombuffer(self.codes, dtype=np.intc) if self.codes else np.zeros(0, dtype=np.intc)
+        return np.bincount(codes, minlength=len(self.values))
+
+    def histogram(self, limit: Optional[int] = TOP_N) -> Dict[str, int]:
+        """Value counts, most frequent first."""
+        counts = self.counts()
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return {self.values[i]: int(counts[i]) for i in order}
+
+    def duplicates(self) -> List[str]:
+        """Values that occur more than once."""
+        counts = self.counts()
+        return sorted(self.values[i] for i in np.flatnonzero(counts > 1))
+
+class CatalogSummaryBuilder:
+    """
+    Accumulates catalog aggregates one products.json page at a time.
+    Products are deduplicated with the same handle/title key as
+    dedupe_raw_products, so counts match the returned product_catalog.
+    Only numbers and integer codes are kept between pages; the stats
+    themselves are computed in one vectorized pass in to_model().
+    """
+
+    def __init__(self):
+        self._seen = set()
+        self.handles = _Factor()
+        self.titles = _Factor()
+        self.variant_counts = array("i")
+        self.prices = array("d")
+        self.available = array("b")
+        self.currencies = _Factor()
+        self.tags = _Factor()
+        self.product_types = _Factor()
+        self.vendors = _Factor()
+
+    def add_product(self, p: Dict) -> None:
+        if p.get("handle"):
+            self.handles.add(p["handle"].lower())
+        key = raw_product_key(p)
+        if not key or key in self._seen:
+            return
+        self._seen.add(key)
+
+        variants = p.get("variants") or []
+        self.variant_counts.append(len(variants))
+        for v in variants:
+            self.prices.append(_variant_price(v))
+            self.available.append(1 if v.get("available", True) else 0)
+            currency = v.get("currency") or p.get("currency")
+            if currency:
+                self.currencies.add(currency)
+
+        for t in _tags_of(p):
+            self.tags.add(t)
+        if p.get("product_type"):
+            self.product_types.add(p["product_type"])
+        if p.get("vendor"):
+            self.vendors.add(p["vendor"])
+        if p.get("title"):
+            self.titles.add(p["title"].strip().lower())
+
+    def add_products(self, raw_items: List[Dict]) -> None:
+        for p in raw_items:
+            self.add_product(p)
+
+    def to_model(self) -> CatalogSummary:
+        variant_counts = np.frombuffer(self.variant_counts, dtype=np.intc) if self.variant_counts else np.zeros(0, dtype=np.intc)
+        prices = np.frombuffer(self.prices, dtype=np.float64) if self.prices else np.zeros(0)
+        available = np.frombuffer(self.available, dtype=np.int8) if self.available else np.zeros(0, dtype=np.int8)
+
+        price_stats = None
+        valid = prices[~np.isnan(prices)]
+        if valid.size:
+            pct = np.percentile(valid, PERCENTILES)
+            price_stats = PriceStats(
+                count=int(valid.size),
+                min=float(valid.min()),
+                max=float(valid.max()),
+                mean=round(float(valid.mean()), 2),
+                median=float(np.median(valid)),
+                percentiles={f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, pct)},
+            )
+
+        variant_stats = VariantStats(
+            total=int(variant_counts.sum()),
+            available=int(available.sum()),
+            min_per_product=int(variant_counts.min()) if variant_counts.size else 0,
+            max_per_product=int(variant_counts.max()) if variant_counts.size else 0,
+            mean_per_product=round(float(variant_counts.mean()), 2) if variant_counts.size else 0.0,
+        )
+
+        return CatalogSummary(
+            product_count=int(variant_counts.size),
+            variants=variant_stats,
+            prices=price_stats,
+            currencies=self.currencies.histogram(limit=None),
+            tags=self.tags.histogram(),
+            distinct_tags=len(self.tags.values),
+            product_types=self.product_types.histogram(),
+            distinct_product_types=len(self.product_types.values),
+            vendors=self.vendors.histogram(),
+            distinct_vendors=len(self.vendors.values),
+            duplicate_handles=self.handles.duplicates(),
+            duplicate_titles=self.titles.duplicates(),
+        )
+
+def summarize_catalog(raw_items: List[Dict]) -> CatalogSummary:
+    builder = CatalogSummaryBuilder()
+    builder.add_products(raw_items)
+    return builder.to_model()
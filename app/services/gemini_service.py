@@ -12,9 +12,17 @@ if not GEMINI_API_KEY:
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel('gemini-flash-latest')
 
+# Computed from the catalog and re-attached in main.py; Gemini never fills these
+EXCLUDED_FIELDS = ("catalog_summary",)
+EXCLUDED_DEFS = ("CatalogSummary", "PriceStats", "VariantStats")
+
 def get_target_schema() -> str:
     """Generates a JSON string of the BrandContext schema."""
     schema = BrandContext.model_json_schema()
+    for field in EXCLUDED_FIELDS:
+        schema["properties"].pop(field, None)
+    for name in EXCLUDED_DEFS:
+        schema.get("$defs", {}).pop(name, None)
     return json.dumps(schema, indent=2)
 
 async def structure_data_with_gemini(raw_data: dict) -> dict:
@@ -41,6 +41,16 @@ def absolute(base: str, href: str | None) -> str | None:
     if not href: return None
     return urljoin(base + "/", href)
 
+def raw_product_key(p: Dict) -> str:
+    """Dedup key for a raw products.json item: handle, falling back to title."""
+    return (p.get("handle") or "").lower() or (p.get("title") or "").lower()
+
+PRICE_KEYS = ("price", "cost", "amount", "value")
+
+def raw_variant_price(v: Dict):
+    """First price-like field a raw variant carries; None if it has none."""
+    return next((v[k] for k in PRICE_KEYS if v.get(k) is not None), None)
+
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"(?:(?:\+?\d{1,3}[\s-]?)?(?:\(?\d{3,4}\)?[\s-]?)\d{3,4}[\s-]?\d{3,4})")
 
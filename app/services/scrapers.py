@@ -1,69 +1,116 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, AsyncIterator
 import httpx
 from bs4 import Tag
+from pydantic import ValidationError
 from app.models import (
     BrandContext, Product, FAQ, Policies,
     SocialHandles, ContactDetails, ImportantLinks
 )
 
+from .analytics import CatalogSummaryBuilder
+from .variants import VariantTableBuilder
 from .helpers import get_universal_price, get_universal_currency
 from .helpers import (
-    norm_base, fetch_text, fetch_json, soup, is_shopify_html, absolute,
+    norm_base, fetch_text, fetch_json, soup, is_shopify_html, absolute, raw_product_key, raw_variant_price,
     EMAIL_RE, PHONE_RE
 )
 
 # ---------- Product catalog with PAGINATION ----------
-async def get_products(client: httpx.AsyncClient, base: str) -> List[Product]:
-    products: List[Product] = []
-    
+async def iter_product_pages(
+    client: httpx.AsyncClient, base: str, raise_errors: bool = False
+) -> AsyncIterator[List[Dict]]:
+    # With raise_errors, a failed fetch after the first page (or on every
+    # candidate URL) is re-raised instead of silently ending the catalog.
     candidate_urls = [
         f"{base}/products.json?limit=250",
         f"{base}/collections/all/products.json?limit=250",
     ]
 
+    last_error: Optional[Exception] = None
     for url_template in candidate_urls:
         page = 1
+        found = False
         while True:
             try:
                 paginated_url = f"{url_template}&page={page}"
                 data = await fetch_json(client, paginated_url)
                 items = data.get("products") or data.get("items") or []
-
-                if not items:
-                    break 
-
-                for p in items:
-                    variants = p.get("variants", [])
-                    price = (variants[0].get("price") or variants[0].get("cost") or variants[0].get("amount") or variants[0].get("value")) if variants else None
-                    currency = variants[0].get("currency") or p.get("currency") if variants else None
-                    images = p.get("images") or []
-                    raw_img = (images[0].get("src") if images else None) or (p.get("image") or {}).get("src")
-                    image = absolute(base, raw_img) if raw_img else None
-                    handle = p.get("handle")
-                    prod_url = absolute(base, f"/products/{handle}") if handle else None
-
-                    products.append(Product(
-                        title=p.get("title") or "", handle=handle, url=prod_url,
-                        price=str(price) if price is not None else None,
-                        currency=currency, image=image, tags=p.get("tags", [])
-                    ))
-                
-                page += 1
-            
-            except Exception:
+            except Exception as e:
+                if raise_errors and found:
+                    raise
+                last_error = e
                 break
+
+            if not items:
+                break 
+
+            found = True
+            yield items
+            page += 1
         
-        if products:
-            break
+        if found:
+            return
 
-    seen = set()
-    deduped = []
-    for p in products:
-        key = (p.handle or "").lower() or (p.title or "").lower()
+    if raise_errors and last_error:
+        raise last_error
+
+def dedupe_raw_products(raw_items: List[Dict], seen: set) -> List[Dict]:
+    unique = []
+    for p in raw_items:
+        key = raw_product_key(p)
         if key and key not in seen:
             seen.add(key)
-            deduped.append(p)
-    return deduped
+            unique.append(p)
+    return unique
+
+def parse_products(raw_items: List[Dict], base: str) -> List[Product]:
+    # Expects items already passed through dedupe_raw_products
+    products: List[Product] = []
+    for p in raw_items:
+        variants = p.get("variants", [])
+        price = raw_variant_price(variants[0]) if variants else None
+        currency = variants[0].get("currency") or p.get("currency") if variants else None
+        images = p.get("images") or []
+        raw_img = (images[0].get("src") if images else None) or (p.get("image") or {}).get("src")
+        image = absolute(base, raw_img) if raw_img else None
+        handle = p.get("handle")
+        prod_url = absolute(base, f"/products/{handle}") if handle else None
+        tags = p.get("tags", [])
+        if isinstance(tags, str):
+            tags = [t.strip() for t in tags.split(",") if t.strip()]
+
+        try:
+            products.append(Product(
+                title=p.get("title") or "", handle=handle, url=prod_url,
+                price=str(price) if price is not None else None,
+                currency=currency, image=image, tags=tags
+            ))
+        except ValidationError:
+            # One malformed item shouldn't cost us the rest of the catalog
+            continue
+    return products
+
+async def get_products(
+    client: httpx.AsyncClient,
+    base: str,
+    include_products: bool = True,
+    summary_builder: Optional[CatalogSummaryBuilder] = None,
+    variant_builder: Optional[VariantTableBuilder] = None,
+) -> List[Product]:
+    # Parsed page by page so raw items are dropped as we go. The summary
+    # sees every raw item so it can report duplicates; the rest see each
+    # product once.
+    products: List[Product] = []
+    seen = set()
+    async for items in iter_product_pages(client, base):
+        if summary_builder is not None:
+            summary_builder.add_products(items)
+        unique = dedupe_raw_products(items, seen)
+        if include_products:
+            products.extend(parse_products(unique, base))
+        if variant_builder is not None:
+            variant_builder.add_products(unique)
+    return products
 
 # ---------- Hero products from homepage ----------
 def extract_hero_products(home_soup, base: str) -> List[Product]:
@@ -219,7 +266,12 @@ def find_about_and_links(home_soup, base: str):
     return about_page_url, ImportantLinks(**imp)
 
 # ---------- Main orchestrator ----------
-async def fetch_brand_context(website_url: str) -> BrandContext:
+async def fetch_brand_context(
+    website_url: str,
+    include_catalog_summary: bool = False,
+    include_product_catalog: bool = True,
+    variant_builder: Optional[VariantTableBuilder] = None,
+) -> BrandContext:
     base = norm_base(website_url)
     async with httpx.AsyncClient(follow_redirects=True) as client:
         home_html = ""
@@ -239,7 +291,14 @@ async def fetch_brand_context(website_url: str) -> BrandContext:
         if og_site and og_site.get("content"): brand_name = og_site["content"]
 
         # Catalog
-        product_catalog = await get_products(client, base)
+        summary_builder = CatalogSummaryBuilder() if include_catalog_summary else None
+        product_catalog = await get_products(
+            client, base,
+            include_products=include_product_catalog,
+            summary_builder=summary_builder,
+            variant_builder=variant_builder,
+        )
+        catalog_summary = summary_builder.to_model() if summary_builder is not None else None
 
         # Hero products
         hero_products = extract_hero_products(doc, base)
@@ -325,6 +384,7 @@ async def fetch_brand_context(website_url: str) -> BrandContext:
             base_url=base,
             product_catalog=product_catalog,
             hero_products=hero_products,
+            catalog_summary=catalog_summary,
             policies=policies,
             faqs=faqs_clean,
             social_handles=social_handles,
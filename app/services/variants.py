@@ -0,0 +1,112 @@
+import math
+from array import array
+from typing import List, Dict, Optional, Iterator
+from .helpers import raw_variant_price
+
+OPTION_KEYS = ("option1", "option2", "option3")
+
+def _to_float(raw) -> float:
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _to_id(raw) -> int:
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return -1
+
+def _to_str(raw) -> Optional[str]:
+    return None if raw is None or raw == "" else str(raw)
+
+def _to_optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+def variant_row(product: Optional[str], v: Dict) -> Dict:
+    """One raw products.json variant as a flat, JSON-ready dict."""
+    variant_id = _to_id(v.get("id"))
+    return {
+        "product": product,
+        "variant_id": variant_id if variant_id >= 0 else None,
+        "sku": _to_str(v.get("sku")),
+        "title": _to_str(v.get("title")),
+        "price": _to_optional(_to_float(raw_variant_price(v))),
+        "compare_at_price": _to_optional(_to_float(v.get("compare_at_price"))),
+        "available": bool(v.get("available", True)),
+        "options": [_to_str(v.get(key)) for key in OPTION_KEYS],
+    }
+
+def iter_variant_rows(raw_items: List[Dict]) -> Iterator[Dict]:
+    for p in raw_items:
+        product = _to_str(p.get("handle") or p.get("title"))
+        for v in p.get("variants") or []:
+            yield variant_row(product, v)
+
+class VariantTableBuilder:
+    """
+    Collects every variant of a catalog in columnar form.
+    Repeated strings (handles, SKUs, option values like "Small") are interned
+    once in a shared pool and referenced by 4-byte indexes; numeric columns
+    live in typed arrays, so memory grows by a few bytes per variant rather
+    than a dict or Product object each. The arrays are kept until to_dict()
+    converts them for the response.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.product = array("i")
+        self.variant_id = array("q")
+        self.sku = array("i")
+        self.title = array("i")
+        self.price = array("d")
+        self.compare_at_price = array("d")
+        self.available = array("b")
+        self.options = [array("i") for _ in OPTION_KEYS]
+
+    def __len__(self) -> int:
+        return len(self.product)
+
+    def _intern(self, value) -> int:
+        if value is None or value == "":
+            return -1
+        value = str(value)
+        idx = self._string_ids.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self._string_ids[value] = idx
+            self.strings.append(value)
+        return idx
+
+    def add_product(self, p: Dict) -> None:
+        product_idx = self._intern(p.get("handle") or p.get("title"))
+        for v in p.get("variants") or []:
+            self.product.append(product_idx)
+            self.variant_id.append(_to_id(v.get("id")))
+            self.sku.append(self._intern(v.get("sku")))
+            self.title.append(self._intern(v.get("title")))
+            self.price.append(_to_float(raw_variant_price(v)))
+            self.compare_at_price.append(_to_float(v.get("compare_at_price")))
+            self.available.append(1 if v.get("available", True) else 0)
+            for col, key in zip(self.options, OPTION_KEYS):
+                col.append(self._intern(v.get(key)))
+
+    def add_products(self, raw_items: List[Dict]) -> None:
+        for p in raw_items:
+            self.add_product(p)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready columns in the VariantTable layout, built in one pass."""
+        return {
+            "count": len(self),
+            "strings": self.strings,
+            "product": self.product.tolist(),
+            "variant_id": [x if x >= 0 else None for x in self.variant_id],
+            "sku": self.sku.tolist(),
+            "title": self.title.tolist(),
+            "price": [_to_optional(x) for x in self.price],
+            "compare_at_price": [_to_optional(x) for x in self.compare_at_price],
+            "available": [bool(x) for x in self.available],
+            "options": [col.tolist() for col in self.options],
+        }
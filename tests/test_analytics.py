@@ -0,0 +1,84 @@
+from app.services.analytics import summarize_catalog, CatalogSummaryBuilder
+
+
+def test_empty_catalog():
+    summary = summarize_catalog([])
+    assert summary.product_count == 0
+    assert summary.variants.total == 0
+    assert summary.prices is None
+    assert summary.tags == {}
+    assert summary.duplicate_handles == []
+
+
+def test_price_stats_skip_missing_and_non_numeric_prices():
+    items = [{"handle": "a", "variants": [
+        {"price": "10.00"}, {"price": "30"}, {"price": None}, {"price": "free"},
+    ]}]
+    summary = summarize_catalog(items)
+    assert summary.variants.total == 4
+    assert summary.prices.count == 2
+    assert summary.prices.min == 10.0
+    assert summary.prices.max == 30.0
+    assert summary.prices.median == 20.0
+
+
+def test_zero_price_is_kept():
+    summary = summarize_catalog([{"handle": "gift", "variants": [{"price": 0}, {"price": "5"}]}])
+    assert summary.prices.count == 2
+    assert summary.prices.min == 0.0
+
+
+def test_comma_string_tags_are_split():
+    items = [
+        {"handle": "a", "tags": ["Summer", "Sale"]},
+        {"handle": "b", "tags": "sale, new ,"},
+    ]
+    summary = summarize_catalog(items)
+    assert summary.tags == {"sale": 2, "summer": 1, "new": 1}
+    assert summary.distinct_tags == 3
+
+
+def test_histograms_report_distinct_counts_when_truncated():
+    items = [{"handle": f"p{i}", "tags": [f"tag-{i}"]} for i in range(60)]
+    summary = summarize_catalog(items)
+    assert len(summary.tags) == 50
+    assert summary.distinct_tags == 60
+
+
+def test_duplicates_are_reported_and_not_counted_twice():
+    items = [
+        {"handle": "tee", "title": "Tee", "variants": [{"price": "10", "available": False}]},
+        {"handle": "TEE", "title": "Tee", "variants": [{"price": "99"}]},
+        {"handle": "tee-2", "title": "tee", "variants": [{"price": "12"}]},
+        {"title": "", "variants": [{"price": "1"}]},
+    ]
+    summary = summarize_catalog(items)
+    assert summary.product_count == 2
+    assert summary.variants.total == 2
+    assert summary.variants.available == 1
+    assert summary.prices.max == 12.0
+    assert summary.duplicate_handles == ["tee"]
+    assert summary.duplicate_titles == ["tee"]
+
+
+def test_duplicate_handles_ignore_title_fallback():
+    items = [{"title": "Mug", "variants": []}, {"title": "mug", "variants": []}]
+    summary = summarize_catalog(items)
+    assert summary.product_count == 1
+    assert summary.duplicate_handles == []
+
+
+def test_builder_accumulates_across_pages():
+    builder = CatalogSummaryBuilder()
+    builder.add_products([{"handle": "a", "vendor": "V", "variants": [{"price": "1", "currency": "USD"}]}])
+    builder.add_products([
+        {"handle": "a", "variants": [{"price": "100"}]},
+        {"handle": "b", "vendor": "V", "currency": "EUR", "variants": [{"price": "3"}, {"price": "5"}]},
+    ])
+    summary = builder.to_model()
+    assert summary.product_count == 2
+    assert summary.variants.max_per_product == 2
+    assert summary.prices.max == 5.0
+    assert summary.vendors == {"V": 2}
+    assert summary.currencies == {"EUR": 2, "USD": 1}
+    assert summary.duplicate_handles == ["a"]
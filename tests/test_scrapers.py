@@ -0,0 +1,84 @@
+import asyncio
+import httpx
+import pytest
+from app.services.scrapers import iter_product_pages, get_products, parse_products
+
+
+def make_client(pages, fail_on=None):
+    def handler(request):
+        if "/collections/" in request.url.path:
+            return httpx.Response(404)
+        page = int(request.url.params["page"])
+        if page == fail_on:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"products": pages.get(page, [])})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def collect(client, **kwargs):
+    async with client:
+        return [items async for items in iter_product_pages(client, "https://shop.test", **kwargs)]
+
+
+def test_get_products_dedupes_across_pages():
+    pages = {1: [{"handle": "a", "title": "A"}], 2: [{"handle": "A", "title": "A"}, {"handle": "b", "title": "B"}]}
+
+    async def run():
+        async with make_client(pages) as client:
+            return await get_products(client, "https://shop.test")
+
+    assert [p.handle for p in asyncio.run(run())] == ["a", "b"]
+
+
+def test_parse_products_accepts_string_tags_and_skips_bad_items():
+    items = [
+        {"handle": "a", "title": "A", "tags": "x, y"},
+        {"handle": "b", "title": "B", "images": [{"src": "http://"}]},
+        {"handle": "c", "title": "C", "tags": ["z"]},
+    ]
+    products = parse_products(items, "https://shop.test")
+    assert [p.handle for p in products] == ["a", "c"]
+    assert products[0].tags == ["x", "y"]
+
+
+def test_failed_page_ends_catalog_by_default():
+    pages = {1: [{"handle": "a"}], 3: [{"handle": "c"}]}
+    assert len(asyncio.run(collect(make_client(pages, fail_on=2)))) == 1
+
+
+def test_failed_page_raises_when_requested():
+    pages = {1: [{"handle": "a"}], 3: [{"handle": "c"}]}
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(collect(make_client(pages, fail_on=2), raise_errors=True))
+
+
+def test_fetch_brand_context_feeds_builders_per_page(monkeypatch):
+    from app.services import scrapers
+    from app.services.variants import VariantTableBuilder
+
+    pages = {
+        1: [{"handle": "tee", "title": "Tee", "variants": [{"id": 1, "price": "5"}, {"id": 2, "price": "6"}]}],
+        2: [{"handle": "tee", "title": "Tee", "variants": [{"id": 1, "price": "5"}]},
+            {"handle": "cap", "title": "Cap", "tags": "x, y", "variants": [{"id": 3, "price": "7"}]}],
+    }
+
+    def handler(request):
+        if request.url.path == "/products.json":
+            return httpx.Response(200, json={"products": pages.get(int(request.url.params["page"]), [])})
+        if request.url.path in ("", "/"):
+            return httpx.Response(200, text="<html><title>Shop</title>cdn.shopify.com</html>")
+        return httpx.Response(404)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(scrapers.httpx, "AsyncClient",
+                        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+
+    builder = VariantTableBuilder()
+    context = asyncio.run(scrapers.fetch_brand_context(
+        "https://shop.test", include_catalog_summary=True, variant_builder=builder
+    ))
+    assert [p.handle for p in context.product_catalog] == ["tee", "cap"]
+    assert context.product_catalog[1].tags == ["x", "y"]
+    assert context.catalog_summary.product_count == 2
+    assert context.catalog_summary.duplicate_handles == ["tee"]
+    assert list(builder.variant_id) == [1, 2, 3]
@@ -0,0 +1,70 @@
+from app.models import VariantTable
+from app.services.variants import VariantTableBuilder, iter_variant_rows
+
+ITEMS = [
+    {"handle": "tee", "variants": [
+        {"id": 1, "sku": "T-S", "title": "S", "price": "10", "compare_at_price": "15",
+         "available": True, "option1": "S"},
+        {"id": "2", "sku": "T-M", "price": "n/a", "available": False, "option1": "M", "option2": "Red"},
+    ]},
+    {"handle": "cap", "variants": [{"sku": "C-1", "price": 0, "option1": "S"}]},
+    {"handle": "gift-card"},
+]
+
+
+def build(items):
+    builder = VariantTableBuilder()
+    builder.add_products(items)
+    return builder
+
+
+def test_empty_catalog():
+    builder = build([])
+    assert len(builder) == 0
+    table = builder.to_dict()
+    assert table["count"] == 0
+    assert table["strings"] == []
+    assert table["options"] == [[], [], []]
+    assert list(iter_variant_rows([])) == []
+
+
+def test_strings_are_interned_once():
+    builder = build(ITEMS)
+    assert len(builder) == 3
+    assert builder.strings.count("S") == 1
+    assert builder.options[0][0] == builder.options[0][2] == builder.title[0]
+    assert builder.sku.itemsize == 4
+
+
+def test_missing_and_non_numeric_prices_become_none():
+    assert build(ITEMS).to_dict()["price"] == [10.0, None, 0.0]
+    assert [row["price"] for row in iter_variant_rows(ITEMS)] == [10.0, None, 0.0]
+
+
+def test_fallback_price_keys_match_summary():
+    items = [{"handle": "x", "variants": [{"amount": "4.5"}, {"cost": 3}]}]
+    assert build(items).to_dict()["price"] == [4.5, 3.0]
+    assert [row["price"] for row in iter_variant_rows(items)] == [4.5, 3.0]
+
+
+def test_stream_rows():
+    rows = list(iter_variant_rows(ITEMS))
+    assert len(rows) == 3
+    assert rows[1] == {
+        "product": "tee", "variant_id": 2, "sku": "T-M", "title": None,
+        "price": None, "compare_at_price": None, "available": False,
+        "options": ["M", "Red", None],
+    }
+
+
+def test_to_dict_matches_variant_table_schema():
+    builder = VariantTableBuilder()
+    builder.add_products(ITEMS[:1])
+    builder.add_products(ITEMS[1:])
+    table = VariantTable(**builder.to_dict())
+    assert table.count == 3
+    assert table.variant_id == [1, 2, None]
+    assert table.available == [True, False, True]
+    assert table.compare_at_price == [15.0, None, None]
+    assert [table.strings[i] for i in table.product] == ["tee", "tee", "cap"]
+    assert table.options[1] == [-1, table.strings.index("Red"), -1]